@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+import weinstein_screener
+from weinstein_screener import evaluate_panel, panel_details, to_weekly, to_weekly_panel
+
+
+def _weekly_breakout(n_weeks=80):
+    """Weekly closes/volumes for a steady uptrend that breaks out on volume in the last week."""
+    index = pd.date_range("2020-01-03", periods=n_weeks, freq="W-FRI")
+    close = np.linspace(50.0, 100.0, n_weeks)
+    close[-1] = 120.0
+    vol = np.full(n_weeks, 1e6)
+    vol[-1] = 3e6
+    spy = pd.DataFrame({'Close': np.full(n_weeks, 100.0)}, index=index)
+    return pd.Series(close, index=index), pd.Series(vol, index=index), spy
+
+
+def test_missing_week_is_dropped_per_ticker():
+    close, vol, spy = _weekly_breakout()
+    gap = close.index[-10]
+    closes = pd.DataFrame({'A': close, 'B': close.drop(gap)})
+    volumes = pd.DataFrame({'A': vol, 'B': vol.drop(gap)})
+
+    meets, indicators = evaluate_panel(closes, volumes, spy)
+    assert meets.tolist() == [True, True]
+
+    # B in the shared panel is judged exactly like B's own gap-free weekly series
+    alone_meets, alone = evaluate_panel(closes[['B']].dropna(), volumes[['B']].dropna(), spy)
+    assert alone_meets.tolist() == [True]
+    assert panel_details(indicators, 1) == panel_details(alone, 0)
+
+
+def test_weekly_panel_matches_to_weekly():
+    # crosses a year boundary, skips a whole (holiday) week and has weeks ending before Friday
+    days = pd.bdate_range("2019-12-02", "2020-01-24")
+    days = days[(days < "2019-12-23") | (days > "2019-12-27")]
+    days = days.drop(pd.DatetimeIndex(["2020-01-01", "2020-01-17"]))
+    rng = np.random.default_rng(0)
+    close = 100 + rng.standard_normal(len(days)).cumsum()
+    df = pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+                       'Volume': rng.integers(1_000, 10_000, len(days))}, index=days)
+
+    expected = to_weekly(df)
+    closes, volumes = to_weekly_panel({'T': df})
+    pd.testing.assert_series_equal(closes['T'], expected['Close'], check_names=False, check_freq=False)
+    pd.testing.assert_series_equal(volumes['T'], expected['Volume'], check_names=False, check_freq=False,
+                                   check_dtype=False)
+
+
+def test_explain_ticker_with_int64_daily_volume(monkeypatch):
+    # daily bars shaped like yfinance's: float prices, int64 Volume
+    days = pd.bdate_range("2023-01-02", periods=400)
+    close = np.linspace(50.0, 100.0, len(days))
+    close[-5:] = 120.0
+    volume = np.full(len(days), 1_000_000, dtype=np.int64)
+    volume[-5:] = 3_000_000
+    df = pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': volume}, index=days)
+    spy = pd.DataFrame({'Open': 100.0, 'High': 100.0, 'Low': 100.0, 'Close': 100.0, 'Volume': 1}, index=days)
+
+    monkeypatch.setattr(weinstein_screener, 'download_daily', lambda tickers: {'T': df})
+    monkeypatch.setattr(weinstein_screener, 'get_spy_weekly', lambda: to_weekly(spy))
+
+    result = weinstein_screener.explain_ticker('T')
+    assert 'reason' not in result
+    assert result['meets'] is True
+    assert result['details']['close'] == 120.0
@@ -14,22 +14,32 @@ Notes:
 - It uses weekly confirmed signals (based on weekly close). Entry would typically be at next session open.
 
 Usage:
-- pip install yfinance pandas numpy requests beautifulsoup4 tqdm
+- pip install yfinance pandas numpy bottleneck numba pyarrow requests requests-cache lxml tqdm
 - python weinstein_screener.py
 
 Outputs:
-- Prints and saves a CSV `weinstein_candidates.csv` listing tickers that meet the criteria and relevant metrics.
+- Prints and saves a Parquet file `data/weinstein_candidates_YYYYMMDD.parquet` listing tickers that meet the criteria and relevant metrics.
+
+Caching:
+- The S&P 500 ticker list is cached for 24h in `data/sp500_tickers.pkl`.
+- Daily OHLCV is cached per ticker in `data/ohlcv/{START}/{ticker}.parquet`; later runs only download the tail since the last cached session,
+  and a ticker whose cache was written after the last session's close is not downloaded again.
 
 """
 
-import requests
-from bs4 import BeautifulSoup
+import os
+import pickle
+import time
+from io import StringIO
+import requests_cache
 import pandas as pd
 import numpy as np
+import bottleneck as bn
+from numba import njit, prange
 import yfinance as yf
 from datetime import datetime
-from time import sleep
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 # ---------------------------
 # CONFIG
@@ -42,10 +52,18 @@ VOL_AVG_WEEKS = 30
 VOL_MULTIPLIER = 1.5
 RS_REQUIRED = True
 RS_LOOKBACK = 8
-BATCH_SIZE = 50  # download tickers in batches to reduce chance of throttling
-REQUEST_PAUSE = 1.0  # seconds between yfinance batch downloads
 
-OUTPUT_CSV = f"data/weinstein_candidates_{datetime.now().strftime('%Y%m%d')}.csv"
+CACHE_DIR = "data"
+TICKERS_CACHE = os.path.join(CACHE_DIR, "sp500_tickers.pkl")
+TICKERS_CACHE_TTL = 24 * 60 * 60  # seconds before the S&P 500 list is re-fetched
+OHLCV_CACHE_DIR = os.path.join(CACHE_DIR, "ohlcv", START)  # one parquet file of daily bars per ticker; keyed by START
+MARKET_TZ = "America/New_York"
+SESSION_FINAL_TIME = "16:30"  # exchange-local time after which a session's daily bar is treated as final
+SPLIT_RATIO_TOLERANCE = 0.15  # re-fetched vs cached close differing more than this means a split; re-download history
+HTTP_CACHE = os.path.join(CACHE_DIR, "http_cache")  # requests_cache store for the Wikipedia fetch
+MARKET_CAP_WORKERS = 16  # concurrent market-cap lookups
+
+OUTPUT_PATH = f"data/weinstein_candidates_{datetime.now().strftime('%Y%m%d')}.parquet"
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
 
@@ -53,79 +71,378 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(mes
 # HELPERS
 # ---------------------------
 
-def fetch_sp500_tickers():
-    """Fetch current S&P 500 tickers from Wikipedia."""
+_http_session = None
+
+
+def get_http_session():
+    """Return the cached HTTP session used for the Wikipedia constituents fetch.
+
+    It is only hit once TICKERS_CACHE has expired, so instead of a second TTL it
+    revalidates its stored page (ETag / Last-Modified) and only downloads the body
+    again when the page changed. yfinance does not use this session.
+    """
+    global _http_session
+    if _http_session is None:
+        _http_session = requests_cache.CachedSession(HTTP_CACHE, expire_after=requests_cache.EXPIRE_IMMEDIATELY)
+    return _http_session
+
+
+def scrape_sp500_tickers():
+    """Fetch current S&P 500 tickers from Wikipedia, sorted and de-duplicated."""
     url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
-    r = requests.get(url, timeout=10)
+    r = get_http_session().get(url, timeout=10)
     r.raise_for_status()
-    soup = BeautifulSoup(r.text, "html.parser")
-    table = soup.find('table', {'id': 'constituents'})
-    if table is None:
+    # pd.read_html parses with lxml (C) rather than a pure-Python HTML parser
+    try:
+        table = pd.read_html(StringIO(r.text), attrs={'id': 'constituents'})[0]
+    except ValueError:
         # fallback: try first sortable wikitable
-        table = soup.find('table', {'class': 'wikitable sortable'})
-    tickers = []
-    for row in table.find_all('tr')[1:]:
-        cols = row.find_all('td')
-        if len(cols) >= 1:
-            tick = cols[0].text.strip()
-            # yfinance uses BRK-B vs BRK.B style; replace '.' with '-' for tickers like BRK.B -> BRK-B
-            tick = tick.replace('.', '-')
-            tickers.append(tick)
+        table = pd.read_html(StringIO(r.text), attrs={'class': 'wikitable sortable'})[0]
+    # yfinance uses BRK-B vs BRK.B style; replace '.' with '-' for tickers like BRK.B -> BRK-B
+    tickers = table.iloc[:, 0].astype(str).str.strip().str.replace('.', '-', regex=False).tolist()
+    return sorted(set(tickers))
+
+
+def fetch_sp500_tickers():
+    """Return S&P 500 tickers, reusing the cached list if it is younger than TICKERS_CACHE_TTL."""
+    if os.path.exists(TICKERS_CACHE) and time.time() - os.path.getmtime(TICKERS_CACHE) < TICKERS_CACHE_TTL:
+        with open(TICKERS_CACHE, 'rb') as f:
+            return pickle.load(f)
+
+    tickers = scrape_sp500_tickers()
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(TICKERS_CACHE, 'wb') as f:
+        pickle.dump(tickers, f)
     return tickers
 
 
+def ohlcv_cache_path(ticker):
+    return os.path.join(OHLCV_CACHE_DIR, f"{ticker}.parquet")
+
+
+def last_closed_session(now=None):
+    """Return the (tz-aware) time the most recent weekday session's bar became final.
+
+    Exchange holidays are not modelled; on a holiday the cache simply looks incomplete
+    and the (cheap) tail download runs.
+    """
+    now = pd.Timestamp.now(tz=MARKET_TZ) if now is None else now.tz_convert(MARKET_TZ)
+    day = now.tz_localize(None).normalize()
+    final = (day + pd.Timedelta(f"{SESSION_FINAL_TIME}:00")).tz_localize(MARKET_TZ)
+    if final > now:
+        day -= pd.Timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= pd.Timedelta(days=1)
+    return (day + pd.Timedelta(f"{SESSION_FINAL_TIME}:00")).tz_localize(MARKET_TZ)
+
+
+def ohlcv_cache_is_final(ticker, df_daily):
+    """True if the cached bars are complete: they end at the last closed session and were
+    written after it closed, so no partial intraday bar can be in the file."""
+    path = ohlcv_cache_path(ticker)
+    if not os.path.exists(path):
+        return False
+    session = last_closed_session()
+    written = pd.Timestamp(os.path.getmtime(path), unit='s', tz='UTC')
+    return df_daily.index.max().date() == session.date() and written >= session
+
+
+def load_cached_ohlcv(ticker):
+    """Return cached daily OHLCV for a ticker, or None if nothing usable is cached."""
+    path = ohlcv_cache_path(ticker)
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path, engine="pyarrow")
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable cache for {ticker}: {e}")
+        return None
+
+
+def same_price_adjustment(cached, fresh):
+    """True if the re-fetched overlap session's Close matches the cached one.
+
+    yfinance split-adjusts Close/Volume even with auto_adjust=False, so a split since the
+    last run rescales the whole history and the cached bars can no longer be extended.
+    """
+    overlap = cached.index.max()
+    if overlap not in fresh.index:
+        return False
+    ratio = fresh.at[overlap, 'Close'] / cached.at[overlap, 'Close']
+    return abs(ratio - 1) <= SPLIT_RATIO_TOLERANCE
+
+
+def save_cached_ohlcv(ticker, df_daily):
+    os.makedirs(OHLCV_CACHE_DIR, exist_ok=True)
+    df_daily.to_parquet(ohlcv_cache_path(ticker), engine="pyarrow", compression="snappy")
+
+
+def split_download(data, tickers):
+    """Split a yf.download result into {ticker: daily dataframe}; also returns tickers with no data."""
+    if data is None:
+        return {}, list(tickers)
+
+    multi = isinstance(data.columns, pd.MultiIndex)
+    # set of tickers present in the download, built once instead of an Index lookup per ticker
+    present = frozenset(data.columns.get_level_values(0).unique()) if multi else {tickers[0]}
+    frames = {}
+    missing = []
+    for t in tickers:
+        if t not in present:
+            missing.append(t)
+            continue
+        # multi-ticker download has a column level per ticker; single ticker is flat
+        df_daily = data[t].dropna() if multi else data.dropna()
+        if df_daily.empty:
+            missing.append(t)
+            continue
+        frames[t] = df_daily
+    return frames, missing
+
+
+def fetch_daily(tickers, start=START):
+    """Download daily OHLCV for `tickers` from `start`. Returns {ticker: daily dataframe}.
+
+    Tickers that come back missing or all-NaN are retried together in one more bulk request.
+    """
+    def _download(symbols):
+        try:
+            return yf.download(symbols, start=start, end=END, progress=False, group_by='ticker', threads=True, auto_adjust=False)
+        except Exception as e:
+            logging.warning(f"Bulk download failed: {e}")
+            return None
+
+    frames, missing = split_download(_download(tickers), tickers)
+    if missing:
+        logging.info(f"Retrying {len(missing)} tickers")
+        retried, missing = split_download(_download(missing), missing)
+        frames.update(retried)
+        for t in missing:
+            logging.warning(f"Failed downloading {t}")
+
+    for df_daily in frames.values():
+        # yfinance already returns a DatetimeIndex; only coerce if it ever does not
+        if not isinstance(df_daily.index, pd.DatetimeIndex):
+            df_daily.index = pd.to_datetime(df_daily.index)
+    return frames
+
+
+def download_daily(tickers):
+    """Return {ticker: daily OHLCV} for `tickers`, backed by the on-disk parquet cache.
+
+    Cached tickers only fetch the tail starting at their last cached session (that
+    session is re-fetched so a partial intraday bar gets replaced); uncached tickers
+    fetch full history from START. Tickers sharing a start date are downloaded together.
+    If the re-fetched session no longer matches the cache (e.g. after a split), the
+    ticker's full history is downloaded again instead of being appended to.
+    A cache that is already complete up to the last closed session is used as-is, so
+    reruns after the close do no network I/O.
+    """
+    cached = {t: load_cached_ohlcv(t) for t in tickers}
+    frames = {}
+    by_start = {}
+    for t, df in cached.items():
+        if df is not None and not df.empty and ohlcv_cache_is_final(t, df):
+            frames[t] = df
+            continue
+        start = START if df is None or df.empty else df.index.max().strftime('%Y-%m-%d')
+        by_start.setdefault(start, []).append(t)
+
+    refetch = []
+    for start, group in by_start.items():
+        fresh = fetch_daily(group, start)
+        for t in group:
+            df_daily = cached[t]
+            if t in fresh:
+                if df_daily is None or df_daily.empty:
+                    df_daily = fresh[t]
+                elif not same_price_adjustment(df_daily, fresh[t]):
+                    refetch.append(t)
+                    continue
+                else:
+                    df_daily = pd.concat([df_daily, fresh[t]])
+                    df_daily = df_daily[~df_daily.index.duplicated(keep='last')].sort_index()
+                save_cached_ohlcv(t, df_daily)
+            if df_daily is not None and not df_daily.empty:
+                frames[t] = df_daily
+
+    if refetch:
+        logging.info(f"Price adjustment changed for {len(refetch)} tickers (e.g. a split); re-downloading full history")
+        full = fetch_daily(refetch, START)
+        for t in refetch:
+            if t in full:
+                save_cached_ohlcv(t, full[t])
+                frames[t] = full[t]
+            else:
+                # stale but internally consistent; never mix pre- and post-split bars
+                frames[t] = cached[t]
+    return frames
+
+
+def fetch_market_cap(ticker):
+    """Return (ticker, market cap) using yfinance's lightweight fast_info endpoint."""
+    try:
+        return ticker, yf.Ticker(ticker).fast_info["market_cap"]
+    except Exception as e:
+        logging.warning(f"Could not fetch market cap for {ticker}: {e}")
+        return ticker, None
+
+
+def fetch_market_caps(tickers):
+    """Fetch market caps for `tickers` concurrently. Returns {ticker: market cap or None}."""
+    with ThreadPoolExecutor(max_workers=MARKET_CAP_WORKERS) as ex:
+        return dict(ex.map(fetch_market_cap, tickers))
+
+
 def to_weekly(df_daily):
     weekly = df_daily.resample('W-FRI').agg({'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'})
     weekly = weekly.dropna()
     return weekly
 
 
-def compute_indicators(weekly, benchmark_weekly=None):
-    w = weekly.copy()
-    w['SMA30'] = w['Close'].rolling(SMA_WEEKS).mean()
-    w['SMA30_slope'] = w['SMA30'].diff()
-    w['avg_vol30'] = w['Volume'].rolling(VOL_AVG_WEEKS).mean()
-    w['vol_spike'] = w['Volume'] > (VOL_MULTIPLIER * w['avg_vol30'])
-    if benchmark_weekly is not None:
-        b = benchmark_weekly['Close'].reindex(w.index).ffill()
-        w['B_Close'] = b
-        w['RS'] = w['Close'] / w['B_Close']
-        w['RS_slope'] = w['RS'].diff(periods=RS_LOOKBACK)
-    return w
+def to_weekly_panel(frames):
+    """Stack daily frames {ticker: OHLCV} into weekly (n_weeks, n_tickers) Close and Volume frames.
 
-
-def is_weinstein_buy(weekly_ind):
-    """Return True if the last weekly row meets Weinstein buy criteria.
-       Assumes the indicators have been computed on the weekly_ind dataframe.
+    Same weeks as to_weekly's resample('W-FRI') but binned with np.ufunc.reduceat
+    over the whole daily panel instead of resampling each ticker.
+    """
+    closes = pd.concat({t: df['Close'] for t, df in frames.items()}, axis=1).sort_index()
+    volumes = pd.concat({t: df['Volume'] for t, df in frames.items()}, axis=1).reindex(closes.index)
+
+    # W-FRI weeks run Saturday..Friday; 1970-01-03 (epoch day 2) is a Saturday
+    days = closes.index.to_numpy().astype('datetime64[D]').view('i8')
+    week_id = (days + 5) // 7
+    _, first = np.unique(week_id, return_index=True)
+    last = np.r_[first[1:], len(days)] - 1
+
+    traded = np.logical_or.reduceat(closes.notna().to_numpy(), first, axis=0)
+    close = closes.ffill().to_numpy()[last]  # last close of each week
+    # yfinance Volume is int64; bin as float so untraded weeks can be NaN
+    vol = np.add.reduceat(np.nan_to_num(volumes.to_numpy(dtype=np.float64)), first, axis=0)
+    close[~traded] = np.nan
+    vol[~traded] = np.nan
+
+    # week-ending Friday, in the input index's unit like to_weekly's resample index
+    index = pd.DatetimeIndex((week_id[first] * 7 + 1).astype('datetime64[D]')).as_unit(closes.index.unit)
+    return (pd.DataFrame(close, index=index, columns=closes.columns),
+            pd.DataFrame(vol, index=index, columns=closes.columns))
+
+
+# cache=True stores the compiled kernel on disk (__pycache__), so only the first run pays the JIT compile
+@njit(parallel=True, cache=True)
+def _scan_weinstein(close, sma, sma_slope, vol, avg_vol, prior_high, rs_slope, min_weeks, vol_multiplier, rs_required):
+    """Fused check of every Weinstein rule on the last week of each ticker column.
+
+    Panels are (n_weeks, n_tickers); sma_slope and rs_slope hold only the latest week's slope per ticker.
+    NaN inputs fail their comparison, so tickers with missing indicators never qualify.
     """
-    if len(weekly_ind) < (SMA_WEEKS + BASE_LOOKBACK_WEEKS):
-        return False, None
-
-    last = weekly_ind.iloc[-1]
-    # breakout: last close > prior BASE_LOOKBACK_WEEKS highs
-    prior_high = weekly_ind['Close'].iloc[-(BASE_LOOKBACK_WEEKS+1):-1].max()
-    cond_breakout = last['Close'] > prior_high
-    cond_above_sma = (not pd.isna(last['SMA30'])) and (last['Close'] > last['SMA30'])
-    cond_sma_up = (not pd.isna(last['SMA30_slope'])) and (last['SMA30_slope'] > 0)
-    cond_vol = (not pd.isna(last['avg_vol30'])) and bool(last['vol_spike'])
-    cond_rs = True
-    if 'RS_slope' in weekly_ind.columns and RS_REQUIRED:
-        cond_rs = (not pd.isna(last['RS_slope'])) and (last['RS_slope'] > 0)
-
-    details = {
-        'close': last['Close'],
-        'prior_high': prior_high,
-        'SMA30': last['SMA30'],
-        'SMA30_slope': last['SMA30_slope'],
-        'vol': last['Volume'],
-        'avg_vol30': last['avg_vol30'],
-        'vol_spike': bool(last['vol_spike']) if 'vol_spike' in last.index else False,
-        'RS': last.get('RS', np.nan),
-        'RS_slope': last.get('RS_slope', np.nan)
+    T, N = close.shape
+    out = np.zeros(N, np.bool_)
+    for j in prange(N):
+        n_weeks = 0
+        for i in range(T):
+            if not np.isnan(close[i, j]):
+                n_weeks += 1
+        c = close[T - 1, j]
+        ok = (n_weeks >= min_weeks
+              and c > prior_high[T - 2, j]
+              and c > sma[T - 1, j]
+              and sma_slope[j] > 0
+              and vol[T - 1, j] > vol_multiplier * avg_vol[T - 1, j])
+        if rs_required:
+            ok = ok and rs_slope[j] > 0
+        out[j] = ok
+    return out
+
+
+def evaluate_panel(closes, volumes, benchmark_weekly):
+    """Apply the Weinstein buy rules to the latest week of every ticker at once.
+
+    `closes`/`volumes` are weekly (n_weeks, n_tickers) frames from to_weekly_panel.
+    Each ticker is judged on its own weekly series, as to_weekly would produce it:
+    weeks it did not trade are dropped rather than left as NaN gaps in its windows.
+    Returns (meets, indicators): a bool array per ticker and a dict of per-ticker
+    indicator arrays keyed like the details dicts.
+    """
+    # float32 halves the panel's footprint; 7 significant digits is plenty for
+    # these comparisons. Volume stays floating point because missing weeks are NaN.
+    close = closes.to_numpy(dtype=np.float32)
+    vol = volumes.to_numpy(dtype=np.float32)
+
+    # A stable argsort on "traded" moves each column's missing weeks to the top and
+    # keeps its traded weeks in order at the bottom, i.e. a per-ticker dropna that
+    # still ends every column at that ticker's last week. Fortran order then keeps
+    # each ticker's history contiguous for the rolling windows and the scan kernel.
+    order = np.argsort(~np.isnan(close), axis=0, kind='stable')
+    close = np.asfortranarray(np.take_along_axis(close, order, axis=0))
+    vol = np.asfortranarray(np.take_along_axis(vol, order, axis=0))
+
+    sma = bn.move_mean(close, SMA_WEEKS, axis=0)
+    sma_slope = sma[-1] - sma[-2]
+    avg_vol = bn.move_mean(vol, VOL_AVG_WEEKS, axis=0)
+    # the window ending at the second-to-last week covers the BASE_LOOKBACK_WEEKS weeks before the last one
+    prior_high = bn.move_max(close, BASE_LOOKBACK_WEEKS, axis=0)
+
+    # SPY is aligned to the panel's weeks once, then picked at each ticker's last week
+    # and RS_LOOKBACK of its weeks before that
+    b = benchmark_weekly['Close'].reindex(closes.index).ffill().to_numpy(dtype=np.float32)
+    rs = close[-1] / b[order[-1]]
+    rs_slope = rs - close[-1 - RS_LOOKBACK] / b[order[-1 - RS_LOOKBACK]]
+
+    meets = _scan_weinstein(close, sma, sma_slope, vol, avg_vol, prior_high, rs_slope,
+                            SMA_WEEKS + BASE_LOOKBACK_WEEKS, VOL_MULTIPLIER, RS_REQUIRED)
+
+    indicators = {
+        'close': close[-1],
+        'prior_high': prior_high[-2],
+        'SMA30': sma[-1],
+        'SMA30_slope': sma_slope,
+        'vol': vol[-1],
+        'avg_vol30': avg_vol[-1],
+        'vol_spike': vol[-1] > (VOL_MULTIPLIER * avg_vol[-1]),
+        'RS': rs,
+        'RS_slope': rs_slope
     }
+    return meets, indicators
+
+
+def panel_details(indicators, j):
+    """Details dict for the j-th ticker of an evaluate_panel result.
+
+    Values are converted to Python float/bool so float32 stays internal to the computation
+    and the saved output keeps float64 columns.
+    """
+    return {k: v[j].item() for k, v in indicators.items()}
+
+
+def screen_panel(closes, volumes, benchmark_weekly):
+    """Return a details dict, plus 'ticker', for each ticker in the panel that meets the rules."""
+    meets, indicators = evaluate_panel(closes, volumes, benchmark_weekly)
+    return [{**panel_details(indicators, j), 'ticker': closes.columns[j]} for j in np.flatnonzero(meets)]
+
+
+# Weekly SPY benchmark, shared by every screen in this process. _spy_session is the
+# last_closed_session() it was loaded for, or None if the bars may still change.
+_spy_weekly = None
+_spy_session = None
+
+
+def get_spy_weekly():
+    """Return SPY weekly bars (None if unavailable).
+
+    The memo follows the parquet cache's freshness rule: it is reused only while it holds
+    final bars for the latest closed session, otherwise SPY is loaded again.
+    """
+    global _spy_weekly, _spy_session
+    session = last_closed_session()
+    if _spy_weekly is None or _spy_session != session:
+        spy = download_daily(['SPY']).get('SPY')
+        if spy is None:
+            return None
+        _spy_weekly = to_weekly(spy)
+        _spy_session = session if ohlcv_cache_is_final('SPY', spy) else None
+    return _spy_weekly
 
-    meets = cond_breakout and cond_above_sma and cond_sma_up and cond_vol and cond_rs
-    return bool(meets), details
 
 # ---------------------------
 # MAIN SCREENER
@@ -140,59 +457,24 @@ def run_screener():
 
     # We'll download SPY once as benchmark
     logging.info("Downloading benchmark SPY daily data...")
-    spy = yf.download('SPY', start=START, end=END, progress=False, auto_adjust=False)
-
-    # Flatten MultiIndex columns by taking first level only:
-    if isinstance(spy.columns, pd.MultiIndex):
-        spy.columns = spy.columns.get_level_values(0)
-
-    spy.index = pd.to_datetime(spy.index)
-    spy_weekly = to_weekly(spy)
-
-    # Process tickers in batches
-    for i in range(0, len(tickers), BATCH_SIZE):
-        batch = tickers[i:i+BATCH_SIZE]
-        logging.info(f"Downloading batch {i//BATCH_SIZE + 1}: {len(batch)} tickers")
-        try:
-            data = yf.download(batch, start=START, end=END, progress=False, group_by='ticker', threads=True, auto_adjust=False)
-        except Exception as e:
-            logging.warning(f"Batch download failed: {e}. Retrying individually.")
-            data = None
+    spy_weekly = get_spy_weekly()
+    if spy_weekly is None:
+        logging.error("Could not download benchmark SPY data; aborting.")
+        return candidates
 
-        # small pause to avoid throttling
-        sleep(REQUEST_PAUSE)
+    logging.info(f"Downloading daily data for {len(tickers)} tickers...")
+    frames = download_daily(tickers)
 
-        for t in batch:
-            try:
-                if data is None:
-                    df_daily = yf.download(t, start=START, end=END, progress=False)
-                else:
-                    if (isinstance(data.columns, pd.MultiIndex)):
-                        # multi-ticker download
-                        if t in data.columns.levels[0]:
-                            df_daily = data[t].dropna()
-                        else:
-                            # ticker not in batch data
-                            df_daily = yf.download(t, start=START, end=END, progress=False)
-                    else:
-                        # single ticker only
-                        df_daily = data
-
-                if df_daily is None or df_daily.empty:
-                    logging.debug(f"No daily data for {t}, skipping.")
-                    continue
+    for t in tickers:
+        if t not in frames:
+            logging.debug(f"No daily data for {t}, skipping.")
 
-                df_daily.index = pd.to_datetime(df_daily.index)
-                weekly = to_weekly(df_daily)
-                weekly_ind = compute_indicators(weekly, spy_weekly)
-                meets, details = is_weinstein_buy(weekly_ind)
-                if meets:
-                    details['ticker'] = t
-                    candidates.append(details)
-                    logging.info(f"Candidate: {t} | Close: {details['close']:.2f} | SMA30: {details['SMA30']:.2f}")
-
-            except Exception as e:
-                logging.warning(f"Failed processing {t}: {e}")
+    # Screen every ticker at once on the weekly (n_weeks, n_tickers) panel
+    if frames:
+        closes, volumes = to_weekly_panel(frames)
+        candidates = screen_panel(closes, volumes, spy_weekly)
+    for details in candidates:
+        logging.info(f"Candidate: {details['ticker']} | Close: {details['close']:.2f} | SMA30: {details['SMA30']:.2f}")
 
     # Save results
     # After collecting all candidates:
@@ -200,23 +482,16 @@ def run_screener():
         df_cand = pd.DataFrame(candidates).set_index('ticker')
 
         # Add market cap column
-        market_caps = {}
-        for ticker in df_cand.index:
-            try:
-                info = yf.Ticker(ticker).info
-                market_caps[ticker] = info.get("marketCap", None)
-            except Exception as e:
-                logging.warning(f"Could not fetch market cap for {ticker}: {e}")
-                market_caps[ticker] = None
+        market_caps = fetch_market_caps(df_cand.index)
 
-        df_cand["market_cap"] = pd.Series(market_caps)
+        df_cand["market_cap"] = pd.Series(market_caps, dtype="float64")
 
-        # Sort by market cap descending
-        df_cand = df_cand.sort_values(by="market_cap", ascending=False)
+        # Sort by market cap descending (unknown caps, NaN, go last)
+        df_cand = df_cand.iloc[np.argsort(-df_cand["market_cap"].to_numpy(), kind="stable")]
 
         # Save sorted results
-        df_cand.to_csv(OUTPUT_CSV)
-        logging.info(f"Saved {len(candidates)} candidates to {OUTPUT_CSV} (sorted by market cap)")
+        df_cand.to_parquet(OUTPUT_PATH, engine="pyarrow", compression="zstd")
+        logging.info(f"Saved {len(candidates)} candidates to {OUTPUT_PATH} (sorted by market cap)")
     else:
         logging.info("No candidates found meeting the criteria.")
 
@@ -228,33 +503,25 @@ def explain_ticker(ticker: str):
     Returns a dict with results and explanation.
     """
     try:
-        # Download daily data
-        df_daily = yf.download(ticker, start=START, end=END, progress=False, auto_adjust=False)
-        if df_daily is None or df_daily.empty:
+        # Daily data (served from the on-disk cache when available)
+        df_daily = download_daily([ticker]).get(ticker)
+        if df_daily is None:
             return {"ticker": ticker, "meets": False, "reason": "No data available."}
 
-        # Flatten MultiIndex columns if needed
-        if isinstance(df_daily.columns, pd.MultiIndex):
-            df_daily.columns = df_daily.columns.get_level_values(0)
-
-        # Convert to datetime index
-        df_daily.index = pd.to_datetime(df_daily.index)
-
-        # Convert to weekly
-        weekly = to_weekly(df_daily)
-
-        # Download SPY benchmark if not already
-        spy = yf.download('SPY', start=START, end=END, progress=False, auto_adjust=False)
-        if isinstance(spy.columns, pd.MultiIndex):
-            spy.columns = spy.columns.get_level_values(0)
-        spy.index = pd.to_datetime(spy.index)
-        spy_weekly = to_weekly(spy)
+        # Convert to a one-column weekly panel so the same rules as run_screener apply
+        closes, volumes = to_weekly_panel({ticker: df_daily})
+        if len(closes) < (SMA_WEEKS + BASE_LOOKBACK_WEEKS):
+            return {"ticker": ticker, "meets": False, "reason": "Not enough weekly history."}
 
-        # Compute indicators
-        weekly_ind = compute_indicators(weekly, spy_weekly)
+        # SPY benchmark (shared with run_screener / earlier calls in this process)
+        spy_weekly = get_spy_weekly()
+        if spy_weekly is None:
+            return {"ticker": ticker, "meets": False, "reason": "No benchmark data available."}
 
         # Check Weinstein buy rules
-        meets, details = is_weinstein_buy(weekly_ind)
+        meets, indicators = evaluate_panel(closes, volumes, spy_weekly)
+        meets = bool(meets[0])
+        details = panel_details(indicators, 0)
 
         explanation = f"Ticker {ticker} "
         if meets:
@@ -276,7 +543,6 @@ def explain_ticker(ticker: str):
         return {"ticker": ticker, "meets": False, "reason": f"Error: {e}"}
 
 if __name__ == '__main__':
-    import time
     start_time = datetime.now()
     logging.info("Starting Weinstein Stage 2 screener...")
     cands = run_screener()